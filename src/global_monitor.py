@@ -1,16 +1,26 @@
 import os
+import sys
 import boto3
 import re
 import time
 import json
+import queue
+import signal
+import functools
 import shutil
 import tempfile
+import threading
 import traceback
+import contextlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import yaml
 from dotenv import load_dotenv
 import chromedriver_autoinstaller
@@ -24,15 +34,13 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (TimeoutException, NoSuchElementException, StaleElementReferenceException,
+                                        WebDriverException, InvalidSessionIdException,
+                                        JavascriptException)
 
 # webdriver_manager (can be toggled/pinned via CHROMEDRIVER_VERSION)
 #from webdriver_manager.chrome import ChromeDriverManager
 
-# Excel styling
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
-
 
 # ============================ ENV / GLOBALS ============================
 
@@ -65,10 +73,51 @@ def load_yaml_as_env(path: str) -> Dict[str, str]:
             flat[section.upper()] = str(values)
     return flat
 
+# Local cache for the decoded secret so repeated runs skip the Secrets Manager round-trip
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "opsnow_healthchk")
+SECRETS_CACHE_FILE = os.path.join(CACHE_DIR, "secrets.json")
+SECRETS_TTL_SECONDS = int(os.getenv("SECRETS_TTL_SECONDS", "300"))   # 0 = always fetch
+
+def _read_secrets_cache(secret_name: str) -> Optional[Dict[str, str]]:
+    """Return cached secret values if the cache file is fresh and for the same secret."""
+    if SECRETS_TTL_SECONDS <= 0:
+        return None
+    try:
+        if time.time() - os.path.getmtime(SECRETS_CACHE_FILE) > SECRETS_TTL_SECONDS:
+            return None
+        with open(SECRETS_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("secret_name") != secret_name:
+            return None
+        return {k: str(v) for k, v in (data.get("values") or {}).items()}
+    except Exception:
+        return None
+
+def _write_secrets_cache(secret_name: str, values: Dict[str, str]):
+    """Atomically write the cache (owner-only permissions) via temp file + os.replace."""
+    if SECRETS_TTL_SECONDS <= 0:
+        return
+    tmp = None
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, prefix=".secrets_", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"secret_name": secret_name, "values": values}, f)
+        os.replace(tmp, SECRETS_CACHE_FILE)
+        tmp = None
+    except Exception as e:
+        print("Warning: could not cache secrets:", e)
+    finally:
+        if tmp and os.path.exists(tmp):
+            os.remove(tmp)
+
 def load_secrets_manager(secret_name: str) -> Dict[str, str]:
-    """Loads secret JSON from AWS Secrets Manager."""
+    """Loads secret JSON from AWS Secrets Manager (served from the local cache within SECRETS_TTL_SECONDS)."""
     if not secret_name:
         return {}
+    cached = _read_secrets_cache(secret_name)
+    if cached is not None:
+        return cached
     try:
         import boto3
         client = boto3.client("secretsmanager")
@@ -77,10 +126,12 @@ def load_secrets_manager(secret_name: str) -> Dict[str, str]:
         if not secret_string and resp.get("SecretBinary"):
             secret_string = base64.b64decode(resp["SecretBinary"]).decode("utf-8")
         parsed = json.loads(secret_string)
-        return {k: str(v) for k, v in parsed.items()}
+        values = {k: str(v) for k, v in parsed.items()}
     except Exception as e:
         print("Warning: could not load Secrets Manager:", e)
         return {}
+    _write_secrets_cache(secret_name, values)
+    return values
 
 # --- Load YAML defaults (non-secret) ---
 CONFIG_PATH_LOCAL = "src/global_config.yaml"
@@ -104,13 +155,36 @@ OPSNOW_PASSWORD    = os.getenv("OPSNOW_PASSWORD", "")
 XERTICA_USERNAME   = os.getenv("XERTICA_USERNAME", "")
 XERTICA_PASSWORD   = os.getenv("XERTICA_PASSWORD", "")
 SLACK_WEBHOOK_URL  = os.getenv("SLACK_WEBHOOK_URL", "")
+# Optional bot credentials: when set, FAIL screenshots are uploaded to Slack instead of only named
+SLACK_BOT_TOKEN    = os.getenv("SLACK_BOT_TOKEN", "")
+SLACK_CHANNEL_ID   = os.getenv("SLACK_CHANNEL_ID", "")
+# Check failures go out as one Slack message per run, with at most this many screenshots attached
+SLACK_BULK_MAX_SCREENSHOTS = max(0, int(os.getenv("SLACK_BULK_MAX_SCREENSHOTS", "5")))
 GOOGLE_CHAT_WEBHOOK = os.getenv("GOOGLE_CHAT_WEBHOOK", "")
 
 HEADLESS           = _is_truthy(os.getenv("RUNTIME_HEADLESS", "true"))
 TIMEOUT            = int(os.getenv("RUNTIME_TIMEOUT", "30"))
 RENDER_RETRY       = int(os.getenv("RUNTIME_RENDER_RETRY", "15"))
+# Print every locator's matches (count, visibility, text, outerHTML) before resolving it
+LOCATOR_DEBUG      = _is_truthy(os.getenv("RUNTIME_LOCATOR_DEBUG", "false"))
+# Seconds between WebDriverWait polls (Selenium default 0.5); YAML defaults.poll_frequency overrides
+POLL_FREQUENCY     = float(os.getenv("RUNTIME_POLL_FREQUENCY", "0.1"))
 CHROMEDRIVER_VERSION = os.getenv("DRIVER_CHROMEDRIVER_VERSION", "").strip()
 CHROME_USER_DATA_DIR = os.getenv("DRIVER_CHROME_USER_DATA_DIR", "").strip()
+# The checks only read text, so images/fonts are not downloaded by default
+BLOCK_IMAGES       = _is_truthy(os.getenv("DRIVER_BLOCK_IMAGES", "true"))
+# Number of checks run in parallel; each worker owns one pooled Chrome instance
+HEALTHCHECK_CONCURRENCY = max(1, int(os.getenv("HEALTHCHECK_CONCURRENCY", "2")))
+POOL_SIZE             = max(1, int(os.getenv("POOL_SIZE", str(HEALTHCHECK_CONCURRENCY))))
+MAX_USES_PER_INSTANCE = max(0, int(os.getenv("MAX_USES_PER_INSTANCE", "50")))   # 0 = never recycle
+# Clear cookies/storage and blank the page after each check so pooled browsers don't carry state over.
+# Off by default: it also drops the console session the pool logged in with, so every check logs in again.
+RESET_BETWEEN_CHECKS  = _is_truthy(os.getenv("RUNTIME_RESET_BETWEEN_CHECKS", "false"))
+# How long a "no login form on this host" probe result is trusted before probing again
+KC_PROBE_TTL_SECONDS  = max(0, int(os.getenv("RUNTIME_KC_PROBE_TTL_SECONDS", "600")))
+
+# >0: stay up and re-run every N seconds with the same warm browsers (SIGHUP runs immediately); 0 = run once
+RUN_INTERVAL_SECONDS = max(0, int(os.getenv("RUNTIME_RUN_INTERVAL_SECONDS", "0")))
 
 EXCEL_FILE_PREFIX = os.getenv("REPORTING_EXCEL_FILE_PREFIX", "global_health_check_report")
 
@@ -120,9 +194,82 @@ CONFIG_URI = os.getenv("CONFIG_URI", "")
 
 # ============================ FILE HELPERS ============================
 
-driver: Optional[webdriver.Chrome] = None
-wait:   Optional[WebDriverWait]    = None
-TEMP_PROFILE_DIR: Optional[str]    = None 
+# Each worker thread binds its own driver/wait; helpers resolve them via current_driver()/current_wait()
+_DRIVER: contextvars.ContextVar[Optional[webdriver.Chrome]] = contextvars.ContextVar("driver", default=None)
+_WAIT:   contextvars.ContextVar[Optional[WebDriverWait]]    = contextvars.ContextVar("wait", default=None)
+TEMP_PROFILE_DIRS: Dict[int, str] = {}   # id(driver) -> temp Chrome profile we created
+
+# Name of the check running on this thread (set by run_checks_concurrently) for log prefixes
+_CHECK_NAME: contextvars.ContextVar[str] = contextvars.ContextVar("check_name", default="")
+_LOG_LOCK = threading.Lock()
+
+def log(*args):
+    """print() that prefixes "[check name]" on check workers and writes each message in one go (no interleaving)."""
+    msg = " ".join(str(a) for a in args)
+    name = _CHECK_NAME.get()
+    if name:
+        body = msg.lstrip("\n")
+        msg = msg[:len(msg) - len(body)] + "\n".join(f"[{name}] {line}" for line in body.split("\n"))
+    with _LOG_LOCK:
+        sys.stdout.write(msg + "\n")
+        sys.stdout.flush()
+
+def current_driver() -> Optional[webdriver.Chrome]:
+    return _DRIVER.get()
+
+def current_wait() -> Optional[WebDriverWait]:
+    return _WAIT.get()
+
+# (driver session, timeout, poll) -> WebDriverWait, so each wait object is built once per browser
+_WAIT_CACHE: Dict[Tuple[str, float, float], WebDriverWait] = {}
+
+_WAIT_IGNORED = (StaleElementReferenceException, NoSuchElementException)
+
+def make_wait(driver: webdriver.Chrome, seconds: float,
+              poll_frequency: Optional[float] = None) -> WebDriverWait:
+    """WebDriverWait polling every POLL_FREQUENCY s that rides out stale/missing elements between polls."""
+    return WebDriverWait(driver, seconds,
+                         poll_frequency=POLL_FREQUENCY if poll_frequency is None else poll_frequency,
+                         ignored_exceptions=_WAIT_IGNORED)
+
+def cached_wait(seconds: float, poll_frequency: Optional[float] = None) -> WebDriverWait:
+    """make_wait(current_driver(), seconds) reused across calls for the same browser."""
+    driver = current_driver()
+    if poll_frequency is None:
+        poll_frequency = POLL_FREQUENCY
+    key = (driver.session_id, seconds, poll_frequency)
+    w = _WAIT_CACHE.get(key)
+    if w is None:
+        w = _WAIT_CACHE.setdefault(key, make_wait(driver, seconds, poll_frequency))
+    return w
+
+@contextlib.contextmanager
+def bound_driver(driver: webdriver.Chrome, wait: WebDriverWait):
+    """Make driver/wait the current ones for this thread (Selenium sessions are not shared across threads)."""
+    token_d, token_w = _DRIVER.set(driver), _WAIT.set(wait)
+    try:
+        yield driver
+    finally:
+        _DRIVER.reset(token_d)
+        _WAIT.reset(token_w)
+
+@contextlib.contextmanager
+def _no_implicit_wait(driver: webdriver.Chrome):
+    """Zero any implicit wait so explicit waits never pay it per find; restored on exit."""
+    try:
+        prev = driver.timeouts.implicit_wait
+    except Exception:
+        prev = 0
+    if prev:
+        driver.implicitly_wait(0)
+    try:
+        yield
+    finally:
+        if prev:
+            try:
+                driver.implicitly_wait(prev)
+            except Exception:
+                pass
 
 def ts() -> str:
     return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -132,43 +279,101 @@ def ensure_dirs():
     os.makedirs("debug_html", exist_ok=True)
     os.makedirs("debug_json", exist_ok=True)
 
+_SAFE_NAME_RE = re.compile(r'[<>:"/\\|?*\n\r\t]+')
+_MULTI_UND_RE = re.compile(r'__+')
+
+@functools.lru_cache(maxsize=256)
 def safe_filename(name: str) -> str:
     if not isinstance(name, str):
         name = str(name)
-    name = re.sub(r'[<>:"/\\|?*\n\r\t]+', "_", name)
-    name = re.sub(r'__+', '_', name).strip("_ ")
+    name = _SAFE_NAME_RE.sub("_", name)
+    name = _MULTI_UND_RE.sub("_", name).strip("_ ")
     return name[:100] or "file"
 
+# FAIL screenshots are for human triage only: JPEG via raw CDP is far smaller/faster than WebDriver PNG
+SCREENSHOT_QUALITY = int(os.getenv("REPORTING_SCREENSHOT_QUALITY", "60"))
+
+def _capture_screenshot_b64(driver: webdriver.Chrome) -> str:
+    return driver.execute_cdp_cmd("Page.captureScreenshot", {
+        "format": "jpeg", "quality": SCREENSHOT_QUALITY, "captureBeyondViewport": False,
+    })["data"]
+
+def _write_screenshot(path: str, data):
+    """data: base64 JPEG from CDP, or raw PNG bytes from the WebDriver fallback."""
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    with open(path, "wb", buffering=1 << 16) as f:
+        f.write(data)
+    log(f"Screenshot saved: {path}")
+
+# Decode + disk write of every screenshot happen here, overlapping with the next navigation
+_SCREENSHOT_Q: "queue.Queue" = queue.Queue()
+
+def _screenshot_writer():
+    while True:
+        path, data = _SCREENSHOT_Q.get()
+        try:
+            _write_screenshot(path, data)
+        except Exception as e:
+            log("Screenshot save failed:", e)
+        finally:
+            _SCREENSHOT_Q.task_done()
+
+threading.Thread(target=_screenshot_writer, name="screenshot_writer", daemon=True).start()
+
+def flush_screenshots():
+    _SCREENSHOT_Q.join()
+
+def _queue_screenshot(driver: webdriver.Chrome, stem: str) -> Tuple[str, Optional[str]]:
+    """Capture now (CDP JPEG, WebDriver PNG if that fails), write on screenshot_writer -> (path, JPEG b64)."""
+    try:
+        b64 = _capture_screenshot_b64(driver)
+        _SCREENSHOT_Q.put((stem + ".jpg", b64))
+        return stem + ".jpg", b64
+    except Exception as e:
+        log("CDP screenshot failed, falling back to PNG:", e)
+    png = driver.get_screenshot_as_png()
+    _SCREENSHOT_Q.put((stem + ".png", png))
+    return stem + ".png", None
+
 def snap(name: str) -> str:
+    """Screenshot path; the file itself is written asynchronously (flush_screenshots() waits for it)."""
+    return snap_deferred(name)[0]
+
+def snap_deferred(name: str) -> Tuple[str, Optional[str]]:
+    """
+    Like snap(), but also returns the base64 JPEG (None for PNG fallbacks/placeholders)
+    so the image can be handed to Slack without re-reading the file.
+    """
     ensure_dirs()
-    path = os.path.join("screenshots", f"{safe_filename(name)}_{ts()}.png")
+    stem = os.path.join("screenshots", f"{safe_filename(name)}_{ts()}")
+    driver = current_driver()
     try:
         if driver:
-            driver.save_screenshot(path)
-            print(f"Screenshot saved: {path}")
-        else:
-            # create an empty placeholder so caller has a path
-            with open(path, "wb") as f:
-                pass
-            print(f"Driver not initialized; created placeholder screenshot: {path}")
+            return _queue_screenshot(driver, stem)
+        # create an empty placeholder so caller has a path
+        with open(stem + ".jpg", "wb") as f:
+            pass
+        log(f"Driver not initialized; created placeholder screenshot: {stem}.jpg")
     except Exception as e:
-        print("Screenshot save failed:", e)
-    return path
+        log("Screenshot capture failed:", e)
+    return stem + ".jpg", None
 
 def dump_html(name: str) -> str:
     ensure_dirs()
     path = os.path.join("debug_html", f"{safe_filename(name)}_{ts()}.html")
+    driver = current_driver()
     try:
         if driver:
             with open(path, "w", encoding="utf-8") as f:
                 f.write(driver.page_source)
-            print(f"HTML dumped: {path}")
+            log(f"HTML dumped: {path}")
         else:
             with open(path, "w", encoding="utf-8") as f:
                 f.write("")
-            print(f"Driver not initialized; created empty HTML dump: {path}")
+            log(f"Driver not initialized; created empty HTML dump: {path}")
     except Exception as e:
-        print("HTML dump failed:", e)
+        log("HTML dump failed:", e)
     return path
 
 def dump_json(name: str, obj: Any) -> str:
@@ -177,14 +382,19 @@ def dump_json(name: str, obj: Any) -> str:
     try:
         with open(path, "w", encoding="utf-8") as f:
             json.dump(obj, f, ensure_ascii=False, indent=2)
-        print(f"JSON dumped: {path}")
+        log(f"JSON dumped: {path}")
     except Exception as e:
-        print("JSON dump failed:", e)
+        log("JSON dump failed:", e)
     return path
 
 
 # ============================ SLACK HELPERS ============================
 
+# Shared session for all outbound HTTP: keeps TLS connections alive (requests already negotiates gzip)
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                                    max_retries=Retry(total=2, backoff_factor=0.2)))
+
 def _slack_text(check_name: str, incident_msg: str, screenshot_path: Optional[str]) -> str:
     file_name = os.path.basename(screenshot_path) if screenshot_path else ""
     return (
@@ -193,21 +403,177 @@ def _slack_text(check_name: str, incident_msg: str, screenshot_path: Optional[st
         f"- Add Screenshot : {file_name}"
     )
 
-def slack_notify(check_name: str, incident_msg: str, screenshot_path: Optional[str]):
+def _slack_upload(uploads: List[Tuple[str, bytes]], comment: str) -> bool:
+    """
+    Upload in-memory (file_name, bytes) pairs with the external-upload flow behind files.upload_v2,
+    shared as one message carrying `comment`; True on success.
+    """
+    auth = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}
+    files = []
+    for file_name, data in uploads:
+        r = _HTTP.post("https://slack.com/api/files.getUploadURLExternal", headers=auth,
+                       data={"filename": file_name, "length": len(data)}, timeout=10).json()
+        if not r.get("ok"):
+            log(f"Slack getUploadURLExternal failed: {r.get('error')}")
+            return False
+        up = _HTTP.post(r["upload_url"], files={"file": (file_name, data, "image/jpeg")}, timeout=30)
+        if up.status_code >= 300:
+            log(f"Slack file upload returned {up.status_code}")
+            return False
+        files.append({"id": r["file_id"], "title": file_name})
+    done = _HTTP.post("https://slack.com/api/files.completeUploadExternal", headers=auth, json={
+        "files": files,
+        "channel_id": SLACK_CHANNEL_ID,
+        "initial_comment": comment,
+    }, timeout=10).json()
+    if not done.get("ok"):
+        log(f"Slack completeUploadExternal failed: {done.get('error')}")
+    return bool(done.get("ok"))
+
+# Notifications are posted by a single daemon thread so checks never block on Slack
+_SLACK_Q: "queue.Queue" = queue.Queue()
+
+def _slack_post(check_name: str, incident_msg: str, screenshot_path: Optional[str],
+                screenshot_b64: Optional[str] = None):
     try:
-        if not SLACK_WEBHOOK_URL:
-            return
-        payload = {"text": _slack_text(check_name, incident_msg, screenshot_path)}
-        r = requests.post(SLACK_WEBHOOK_URL, json=payload, timeout=10)
-        if r.status_code >= 300:
-            print(f"Slack webhook returned {r.status_code}: {r.text}")
+        text = _slack_text(check_name, incident_msg, screenshot_path)
+        if screenshot_b64 and SLACK_BOT_TOKEN and SLACK_CHANNEL_ID:
+            file_name = os.path.basename(screenshot_path) if screenshot_path else "screenshot.jpg"
+            if _slack_upload([(file_name, base64.b64decode(screenshot_b64))], text):
+                return
+        _slack_send_text(text)
     except Exception as e:
-        print(f"Slack notify failed: {e}")
+        log(f"Slack notify failed: {e}")
+
+def _slack_webhook(text: str):
+    if not SLACK_WEBHOOK_URL:
+        return
+    r = _HTTP.post(SLACK_WEBHOOK_URL, json={"text": text}, timeout=10)
+    if r.status_code >= 300:
+        log(f"Slack webhook returned {r.status_code}: {r.text}")
+
+def _slack_chat_post(text: str) -> bool:
+    r = _HTTP.post("https://slack.com/api/chat.postMessage",
+                   headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
+                   json={"channel": SLACK_CHANNEL_ID, "text": text}, timeout=10).json()
+    if not r.get("ok"):
+        log(f"Slack chat.postMessage failed: {r.get('error')}")
+    return bool(r.get("ok"))
+
+def _slack_send_text(text: str):
+    """Text-only post (no screenshot, or its upload failed): bot channel first, then the webhook."""
+    if SLACK_BOT_TOKEN and SLACK_CHANNEL_ID and _slack_chat_post(text):
+        return
+    _slack_webhook(text)
+
+def _slack_post_bulk(failures: List[Tuple[str, str, Optional[str], Optional[str]]]):
+    try:
+        lines = [f"OpsNow360 Health Check — {len(failures)} check(s) failed"]
+        for check_name, incident_msg, screenshot_path, _ in failures:
+            file_name = os.path.basename(screenshot_path) if screenshot_path else ""
+            lines.append(f"- [{check_name}] : Fail - \"{incident_msg}\"" + (f" ({file_name})" if file_name else ""))
+        text = "\n".join(lines)
+        shots = [(p, b64) for _, _, p, b64 in failures if b64][:SLACK_BULK_MAX_SCREENSHOTS]
+        uploads = [(os.path.basename(p) if p else "screenshot.jpg", base64.b64decode(b64)) for p, b64 in shots]
+        if uploads and SLACK_BOT_TOKEN and SLACK_CHANNEL_ID:
+            if _slack_upload(uploads, text):
+                return
+        _slack_send_text(text)
+    except Exception as e:
+        log(f"Slack bulk notify failed: {e}")
+
+def _slack_worker():
+    while True:
+        post, args = _SLACK_Q.get()
+        try:
+            post(*args)
+        finally:
+            _SLACK_Q.task_done()
+
+threading.Thread(target=_slack_worker, name="slack", daemon=True).start()
+
+def slack_notify(check_name: str, incident_msg: str, screenshot_path: Optional[str],
+                 screenshot_b64: Optional[str] = None):
+    """Queue a notification (non-blocking); slack_flush() waits for the queue to drain."""
+    if not SLACK_WEBHOOK_URL and not (SLACK_BOT_TOKEN and SLACK_CHANNEL_ID):
+        return
+    _SLACK_Q.put_nowait((_slack_post, (check_name, incident_msg, screenshot_path, screenshot_b64)))
+
+def slack_notify_bulk(failures: List[Tuple[str, str, Optional[str], Optional[str]]]):
+    """Queue one message listing every (check, reason, screenshot path, screenshot b64) failure."""
+    if not failures or (not SLACK_WEBHOOK_URL and not (SLACK_BOT_TOKEN and SLACK_CHANNEL_ID)):
+        return
+    _SLACK_Q.put_nowait((_slack_post_bulk, (list(failures),)))
+
+def slack_flush():
+    _SLACK_Q.join()
+
+# Check failures of the current run, sent together by run_all_checks
+_FAILURES: List[Tuple[str, str, Optional[str], Optional[str]]] = []
+_FAILURES_LOCK = threading.Lock()
+
+def record_failure(check_name: str, incident_msg: str, screenshot_path: Optional[str],
+                   screenshot_b64: Optional[str] = None):
+    with _FAILURES_LOCK:
+        # The bulk post attaches at most SLACK_BULK_MAX_SCREENSHOTS images; don't hold the rest in memory
+        if screenshot_b64 and sum(1 for f in _FAILURES if f[3]) >= SLACK_BULK_MAX_SCREENSHOTS:
+            screenshot_b64 = None
+        _FAILURES.append((check_name, incident_msg, screenshot_path, screenshot_b64))
+
+def take_failures() -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+    with _FAILURES_LOCK:
+        failures = _FAILURES[:]
+        _FAILURES.clear()
+    return failures
 
 
 # ============================ SELENIUM/SSO ============================
 
 
+CHROMEDRIVER_CACHE_FILE = os.path.join(CACHE_DIR, "chromedriver.json")
+
+@functools.lru_cache(maxsize=1)
+def resolve_chromedriver_path() -> str:
+    """
+    Path to a chromedriver matching CHROMEDRIVER_VERSION (or latest).
+    Reuses the path recorded on a previous run so ChromeDriverManager (an HTTPS
+    metadata call, possibly a download) only runs on a cache miss.
+    """
+    try:
+        with open(CHROMEDRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("version") == CHROMEDRIVER_VERSION and os.path.exists(cached.get("path", "")):
+            return cached["path"]
+    except Exception:
+        pass
+
+    # Use webdriver-manager but ensure correct version
+    if CHROMEDRIVER_VERSION:
+        path = ChromeDriverManager(driver_version=CHROMEDRIVER_VERSION).install()
+    else:
+        path = ChromeDriverManager().install()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(CHROMEDRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"version": CHROMEDRIVER_VERSION, "path": path}, f)
+    except Exception as e:
+        log("Warning: could not cache chromedriver path:", e)
+    return path
+
+def refresh_chromedriver_path() -> str:
+    """Drop the cached path and resolve again through ChromeDriverManager."""
+    resolve_chromedriver_path.cache_clear()
+    try:
+        os.remove(CHROMEDRIVER_CACHE_FILE)
+    except OSError:
+        pass
+    return resolve_chromedriver_path()
+
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+]
+
 def create_driver():
     """
     Create a Chrome driver that supports:
@@ -215,7 +581,6 @@ def create_driver():
     - AMD64 EC2 (installs Google Chrome + matching chromedriver)
     - Avoids webdriver-manager downloading wrong architecture binaries
     """
-    global TEMP_PROFILE_DIR
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.chrome.service import Service
     import shutil
@@ -231,21 +596,25 @@ def create_driver():
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--disable-features=TranslateUI")
+    if BLOCK_IMAGES:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
 
     # ---- USER DATA DIR FIX ----
     profile_dir = CHROME_USER_DATA_DIR or tempfile.mkdtemp(prefix="opsnow_chrome_")
-    if not CHROME_USER_DATA_DIR:
-        TEMP_PROFILE_DIR = profile_dir
     chrome_options.add_argument(f"--user-data-dir={profile_dir}")
 
     # ---- DETECT ARCH ----
     arch = subprocess.check_output(["uname", "-m"]).decode().strip()
-    print(f"Detected architecture: {arch}")
+    log(f"Detected architecture: {arch}")
 
     # ---- ARM64 PATH (Graviton) ----
     if arch in ("aarch64", "arm64"):
 
-        print("ARM64 detected → using system chromium + chromium-driver")
+        log("ARM64 detected → using system chromium + chromium-driver")
 
         # Ensure chromium exists
         if not shutil.which("chromium") and not shutil.which("chromium-browser"):
@@ -256,41 +625,183 @@ def create_driver():
         if not chromedriver_path:
             raise RuntimeError("chromium-driver is not installed inside the Docker image.")
 
-        print(f"Using chromium driver at: {chromedriver_path}")
+        log(f"Using chromium driver at: {chromedriver_path}")
         driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options)
 
     # ---- AMD64 PATH ----
     else:
-        print("AMD64 detected → using Google Chrome + matching chromedriver")
+        log("AMD64 detected → using Google Chrome + matching chromedriver")
 
         try:
             chrome_bin = shutil.which("google-chrome") or shutil.which("chrome")
             if chrome_bin:
                 chrome_options.binary_location = chrome_bin
 
-            # Use webdriver-manager but ensure correct version
-            if CHROMEDRIVER_VERSION:
-                chromedriver_path = ChromeDriverManager(driver_version=CHROMEDRIVER_VERSION).install()
-            else:
-                chromedriver_path = ChromeDriverManager().install()
-
-            print(f"Using chromedriver at: {chromedriver_path}")
-            driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options)
+            # webdriver-manager lookup is cached (in-process + on disk); see resolve_chromedriver_path
+            chromedriver_path = resolve_chromedriver_path()
+            log(f"Using chromedriver at: {chromedriver_path}")
+            try:
+                driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options)
+            except Exception as e:
+                # Chrome may have auto-updated past the cached driver: resolve a fresh one once
+                fresh_path = refresh_chromedriver_path()
+                if fresh_path == chromedriver_path:
+                    raise
+                log(f"Cached chromedriver failed ({e}); retrying with: {fresh_path}")
+                driver = webdriver.Chrome(service=Service(fresh_path), options=chrome_options)
 
         except Exception as e:
             raise RuntimeError(f"Failed to start Chrome on AMD64: {e}")
 
-    wait = WebDriverWait(driver, TIMEOUT)
+    if not CHROME_USER_DATA_DIR:
+        TEMP_PROFILE_DIRS[id(driver)] = profile_dir
+
+    # Also drop image/font requests at the network layer (covers CSS backgrounds, SVG icons, web fonts)
+    if BLOCK_IMAGES:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            log("Could not set blocked URLs:", e)
+
+    # Preload the JS extractors into every page so fallbacks don't re-ship the source
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _JS_ALL})
+    except Exception as e:
+        log("Could not preload JS scrapers (will send them inline):", e)
+    wait = make_wait(driver, TIMEOUT)
     return driver, wait
 
 
+def _reset_between_checks(driver: webdriver.Chrome):
+    """Drop all cookies and the open page's storage, then unload its DOM; raises if the session is unusable."""
+    # delete_all_cookies() only reaches the current domain; the CDP call clears every cookie in the profile
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    # Storage for every origin still loaded (top page + frames, e.g. an embedded SSO frame)
+    origins = set()
+    frames = [driver.execute_cdp_cmd("Page.getFrameTree", {}).get("frameTree") or {}]
+    while frames:
+        node = frames.pop()
+        origin = (node.get("frame") or {}).get("securityOrigin") or ""
+        if origin.startswith("http"):
+            origins.add(origin)
+        frames.extend(node.get("childFrames") or [])
+    for origin in origins:
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+            "origin": origin,
+            "storageTypes": "local_storage,indexeddb,websql,cache_storage,service_workers",
+        })
+    # sessionStorage isn't covered by Storage.clearDataForOrigin
+    driver.execute_script("try{sessionStorage.clear();}catch(e){}")
+    # Parent-domain cookies (e.g. .opsnow.com) went too, so any host may show a login form again
+    session_id = driver.session_id
+    for key in [k for k in list(_KC_HOST_CACHE) if k[0] == session_id]:
+        _KC_HOST_CACHE.pop(key, None)
+    driver.get("about:blank")
+
+def quit_driver(driver: webdriver.Chrome):
+    """Quit a driver and remove the temp Chrome profile created for it (if any)."""
+    session_id = getattr(driver, "session_id", None)
+    for cache in (_KC_HOST_CACHE, _WAIT_CACHE):
+        for key in [k for k in list(cache) if k[0] == session_id]:
+            cache.pop(key, None)
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    profile_dir = TEMP_PROFILE_DIRS.pop(id(driver), None)
+    try:
+        if profile_dir and os.path.isdir(profile_dir):
+            shutil.rmtree(profile_dir, ignore_errors=True)
+    except Exception:
+        pass
+
+
+class BrowserPool:
+    """
+    Pre-warmed Chrome instances shared by the check workers.
+    acquire() hands out an idle (driver, wait) pair; release() puts it back, or
+    quits it and launches a fresh one once it has served max_uses checks
+    (0 = never recycle) so long runs do not accumulate Chrome memory.
+    """
+
+    def __init__(self, size: int, max_uses: int = 0):
+        self.size = size
+        self.max_uses = max_uses
+        self._idle: "queue.Queue" = queue.Queue()
+        self._live: Dict[int, webdriver.Chrome] = {}
+        self._use_count: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        for i in range(size):
+            log(f"Starting browser {i + 1}/{size}…")
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        """Launch a driver and do the initial console login on it."""
+        driver, wait = create_driver()
+        with self._lock:
+            self._live[id(driver)] = driver
+            self._use_count[id(driver)] = 0
+        with bound_driver(driver, wait):
+            try:
+                login_console()
+            except Exception as e:
+                log(f"Initial console login failed: {e} (will SSO per-page)")
+        return driver, wait
+
+    def _retire(self, driver: webdriver.Chrome):
+        with self._lock:
+            self._live.pop(id(driver), None)
+            self._use_count.pop(id(driver), None)
+        quit_driver(driver)
+
+    def acquire(self):
+        item = self._idle.get()
+        if item is None:
+            # a previous relaunch failed; retry it for this check
+            try:
+                item = self._spawn()
+            except Exception:
+                self._idle.put(None)
+                raise
+        return item
+
+    def release(self, item, broken: bool = False):
+        driver, _ = item
+        with self._lock:
+            uses = self._use_count.get(id(driver), 0) + 1
+            self._use_count[id(driver)] = uses
+        if broken or (self.max_uses and uses >= self.max_uses):
+            log(f"Recycling browser after {uses} use(s){' (broken session)' if broken else ''}…")
+            self._retire(driver)
+            try:
+                item = self._spawn()
+            except Exception as e:
+                log("Browser relaunch failed (will retry on next acquire):", e)
+                item = None
+        self._idle.put(item)
+
+    def close(self):
+        with self._lock:
+            drivers = list(self._live.values())
+        for d in drivers:
+            self._retire(d)
+
+
+_JS_ON_KEYCLOAK = r"""
+    const q = s => document.querySelector(s);
+    return !!q('[name=username]') && !!q('[name=password]') && !!q('#kc-login');
+"""
+
+# (driver session, hostname) -> (whether the Keycloak form was seen on the last probe, monotonic time of it)
+_KC_HOST_CACHE: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+
 def on_keycloak() -> bool:
+    """Keycloak login form present? (one round-trip instead of three find_element calls)"""
+    driver = current_driver()
     try:
-        driver.find_element(By.NAME, "username")
-        driver.find_element(By.NAME, "password")
-        driver.find_element(By.ID, "kc-login")
-        return True
-    except NoSuchElementException:
+        return bool(driver.execute_script(_JS_ON_KEYCLOAK))
+    except Exception:
         return False
 
 def do_keycloak_login(current_url: Optional[str] = None,
@@ -319,6 +830,7 @@ def do_keycloak_login(current_url: Optional[str] = None,
         raise ValueError("Keycloak credentials not found. "
                          "Set OPSNOW_USERNAME/OPSNOW_PASSWORD (and XERTICA_* for Xertica if needed).")
 
+    wait = current_wait()
     try:
         u = wait.until(EC.presence_of_element_located((By.NAME, "username")))
         p = wait.until(EC.presence_of_element_located((By.NAME, "password")))
@@ -327,7 +839,7 @@ def do_keycloak_login(current_url: Optional[str] = None,
         p.clear(); p.send_keys(pwd)
         b.click()
     except Exception:
-        print("Exception while filling Keycloak login form:")
+        log("Exception while filling Keycloak login form:")
         traceback.print_exc()
         raise
 
@@ -339,58 +851,124 @@ def safe_do_keycloak_login(current_url: Optional[str] = None,
                           username_override=username_override,
                           password_override=password_override)
     except Exception as e:
-        print("safe_do_keycloak_login: failed:", e)
+        log("safe_do_keycloak_login: failed:", e)
         traceback.print_exc()
         raise
 
+# Any rendered value/chart node; preloaded as window.__valueSel, inlined where the preload is missing
+_VALUE_UNION_SELECTOR = "em.value,.value,.num,.number,.count,.am5-layer"
+_JS_VALUE_SEL = f"(window.__valueSel || {json.dumps(_VALUE_UNION_SELECTOR)})"
+
+# Page is usable once loaded and showing either the Keycloak form or a rendered value
+_JS_PAGE_SETTLED = r"""
+    return document.readyState === "complete" && (
+      !!document.querySelector("#kc-login") ||
+      !!document.querySelector(""" + _JS_VALUE_SEL + r"""));
+"""
+
+def wait_page_settled(seconds: float = 2):
+    """Replaces the fixed post-navigation sleep: returns as soon as the page settles, at most `seconds`."""
+    try:
+        cached_wait(seconds).until(
+            lambda d: d.execute_script(_JS_PAGE_SETTLED)
+        )
+    except TimeoutException:
+        pass
+    except WebDriverException as e:
+        # navigation mid-poll ("execution context was destroyed") or a dead session: don't fail the check here
+        log("Page settle wait aborted (continuing):", str(e).splitlines()[0] if str(e) else e)
+
+# Resolves true as soon as a value-like node exists or is inserted, false after arguments[0] ms
+_JS_WAIT_VALUE_NODES = r"""
+    const ms = arguments[0], cb = arguments[arguments.length - 1];
+    const sel = """ + _JS_VALUE_SEL + r""";
+    if (document.querySelector(sel)) return cb(true);
+    const o = new MutationObserver(() => {
+      if (document.querySelector(sel)) { o.disconnect(); clearTimeout(t); cb(true); }
+    });
+    o.observe(document.documentElement, {childList: true, subtree: true});
+    const t = setTimeout(() => { o.disconnect(); cb(false); }, ms);
+"""
+
+def wait_for_value_nodes(seconds: float = 10) -> bool:
+    """
+    One async script instead of polling find_elements; False once `seconds` have passed.
+    A navigation fails the pending script ("document unloaded"), so it is re-issued on the
+    new document for the rest of the deadline instead of ending the wait.
+    """
+    driver = current_driver()
+    deadline = time.monotonic() + seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            return bool(driver.execute_async_script(_JS_WAIT_VALUE_NODES, int(remaining * 1000)))
+        except InvalidSessionIdException:
+            return False
+        except WebDriverException:
+            time.sleep(min(POLL_FREQUENCY, max(0.0, deadline - time.monotonic())))
+
 def open_with_sso(url: str,
                   debug_name: str,
                   username_override: Optional[str] = None,
                   password_override: Optional[str] = None,
                   clear_cookies_before: bool = False):
+    driver = current_driver()
     if clear_cookies_before:
         try:
             driver.delete_all_cookies()
         except Exception:
             pass
     driver.get(url)
-    time.sleep(2)
-    if on_keycloak():
-        print(f"Keycloak detected — logging in for {url} …")
+    wait_page_settled()
+    # Once a host has served this browser without a login form, skip the probe on later visits
+    kc_key = (driver.session_id, urlparse(url).hostname or "")
+    if clear_cookies_before:
+        _KC_HOST_CACHE.pop(kc_key, None)
+    seen, probed_at = _KC_HOST_CACHE.get(kc_key, (True, 0.0))
+    if not seen and time.monotonic() - probed_at < KC_PROBE_TTL_SECONDS:
+        kc = False
+    else:
+        # re-probe once the entry is stale: the SSO session can expire while the daemon keeps browsers warm
+        kc = on_keycloak()
+        _KC_HOST_CACHE[kc_key] = (kc, time.monotonic())
+    if kc:
+        log(f"Keycloak detected — logging in for {url} …")
         safe_do_keycloak_login(current_url=url,
                                username_override=username_override,
                                password_override=password_override)
-    try:
-        WebDriverWait(driver, 15).until(
-            lambda d: len(d.find_elements(By.CSS_SELECTOR,
-                    "em.value, .value, .num, .number, .count, .am5-layer")) > 0
-        )
-    except TimeoutException:
-        pass
-    time.sleep(1)
+    wait_for_value_nodes(15)
 
 def wait_non_empty_text(get_text, seconds=RENDER_RETRY) -> str:
+    """Poll get_text() until it yields a real value; starts at POLL_FREQUENCY and backs off to 1 s per poll."""
     txt = ""
-    for _ in range(seconds):
+    interval = POLL_FREQUENCY
+    deadline = time.monotonic() + seconds
+    while True:
         try:
             txt = (get_text() or "").strip()
         except Exception:
             txt = ""
         if txt and txt != "0" and txt.lower() != "0ea":
             return txt
-        time.sleep(1)
-    return txt
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return txt
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 1.5, max(1.0, POLL_FREQUENCY))
 
 def login_console():
     """Open LOGIN_URL and SSO in, waiting up to TIMEOUT for navigation."""
     if not LOGIN_URL:
-        print("LOGIN_URL not set — skipping initial console login (will SSO per-page).")
+        log("LOGIN_URL not set — skipping initial console login (will SSO per-page).")
         return
-    print("Opening login page…", LOGIN_URL)
+    driver, wait = current_driver(), current_wait()
+    log("Opening login page…", LOGIN_URL)
     driver.get(LOGIN_URL)
-    time.sleep(2)
+    wait_page_settled()
     if on_keycloak():
-        print("Logging in to console via Keycloak…")
+        log("Logging in to console via Keycloak…")
         do_keycloak_login(current_url=LOGIN_URL)
     try:
         host = (urlparse(LOGIN_URL).hostname or "")
@@ -398,14 +976,14 @@ def login_console():
             wait.until(EC.url_contains(host))
     except Exception:
         pass
-    time.sleep(1)
-    print("Login successful (or skipped).")
+    log("Login successful (or skipped).")
 
 
 # ============================ JS FALLBACKS ============================
 
-def js_scan_labels() -> List[Dict[str, str]]:
-    js = r"""
+# Browser-side extractors, keyed by kind. Each entry is a JS function body returning the scraped value.
+_JS_SCRAPERS: Dict[str, str] = {
+    "labels": r"""
     const blocks = Array.from(document.querySelectorAll(
       ".count-item, .summary, .card, .cards, [class*=count], [class*=summary], [class*=kpi]"
     ));
@@ -422,6 +1000,7 @@ def js_scan_labels() -> List[Dict[str, str]]:
     } else {
       const vals = Array.from(document.querySelectorAll("em.value, .value, .num, .number, .count"));
       vals.forEach(v => {
+        // bounded walk: the value node + up to 4 ancestors, one querySelector per hop
         let node = v, label = "";
         for (let i = 0; i < 5 && node; i++) {
           const l = node.querySelector?.("p, .label, .title, h3, h4, dt, .name");
@@ -433,27 +1012,9 @@ def js_scan_labels() -> List[Dict[str, str]]:
       });
     }
     return rows;
-    """
-    return driver.execute_script(js) or []
-
-def pick_value_by_labels(rows: List[Dict[str, str]], label_keys: List[str]) -> str:
-    for r in rows:
-        lab = (r.get("label") or "").strip().lower()
-        val = (r.get("value") or "").strip()
-        if not val:
-            continue
-        for key in label_keys:
-            if key.lower() in lab:
-                return val
-    for r in rows:
-        lab = (r.get("label") or "").strip().lower()
-        val = (r.get("value") or "").strip()
-        if lab == "" and val and val.replace(",", "").isdigit():
-            return val
-    return ""
+    """,
 
-def js_find_ec2_near_aws() -> str:
-    js = r"""
+    "ec2": r"""
     const isVisible = (el) => {
       if (!el) return false;
       const st = getComputedStyle(el);
@@ -471,11 +1032,9 @@ def js_find_ec2_near_aws() -> str:
     }
     const any = all.find(el => (el.textContent || "").trim().toLowerCase() === "ec2" && isVisible(el));
     return any ? "FOUND" : "";
-    """
-    return driver.execute_script(js) or ""
+    """,
 
-def js_find_mtd_cost() -> str:
-    js = r"""
+    "mtd": r"""
     const money = t => /\$\s*[\d,]+(\.\d+)?/.test((t||"").trim());
     const cards = Array.from(document.querySelectorAll("*"))
       .filter(el => /month\s*to\s*date\s*cost/i.test(el.textContent || ""));
@@ -492,11 +1051,9 @@ def js_find_mtd_cost() -> str:
       if (money(t)) return t;
     }
     return "";
-    """
-    return driver.execute_script(js) or ""
+    """,
 
-def js_find_more_available_total() -> str:
-    js = r"""
+    "savings": r"""
     const money = t => /\$\s*[\d,]+(\.\d+)?/.test((t||"").trim());
     const sections = Array.from(document.querySelectorAll("section, div, article"))
       .filter(el => /more\s+available\s+cost\s+savings/i.test(el.textContent || ""));
@@ -511,11 +1068,9 @@ def js_find_more_available_total() -> str:
       }
     }
     return "";
-    """
-    return driver.execute_script(js) or ""
+    """,
 
-def js_find_ceikpi_grade_full() -> str:
-    js = r"""
+    "grade": r"""
     const sections = Array.from(document.querySelectorAll("section,div,article"))
       .filter(el => /total\s*scores/i.test(el.textContent || ""));
     const parenRe = /^\([\d.,]+\)$/;
@@ -537,22 +1092,124 @@ def js_find_ceikpi_grade_full() -> str:
       }
     }
     return "";
+    """,
+}
+_JS_SCRAPE_EMPTY: Dict[str, Any] = {"labels": [], "ec2": "", "mtd": "", "savings": "", "grade": ""}
+
+# Installed on every new document via CDP (see create_driver) so scrapes only send a short call
+_JS_ALL = f"window.__valueSel = {json.dumps(_VALUE_UNION_SELECTOR)};" + "window.__hcScrapers = {" + ",".join(
+    f"{json.dumps(k)}: () => {{ {body} }}" for k, body in _JS_SCRAPERS.items()
+) + "};"
+
+_JS_CALL_PRELOADED = r"""
+    const S = window.__hcScrapers;
+    if (!S) return null;
+    const out = {};
+    for (const k of arguments[0]) {
+      try { out[k] = S[k](); } catch (e) { out[k] = null; }
+    }
+    return out;
+"""
+
+@functools.lru_cache(maxsize=32)
+def _inline_scrape_js(kinds: Tuple[str, ...]) -> str:
+    """Self-contained script for pages where the preload is missing (built once per kinds tuple)."""
+    parts = [f"{json.dumps(k)}: (() => {{ try {{ {_JS_SCRAPERS[k]} }} catch (e) {{ return null; }} }})()"
+             for k in kinds]
+    return "return {" + ",".join(parts) + "};"
+
+def js_scrape_all(page_kinds: List[str]) -> Dict[str, Any]:
     """
-    return driver.execute_script(js) or ""
+    Run the requested extractors in a single execute_script round-trip.
+    Returns {kind: value} for each requested kind, e.g.
+    {labels:[{label,value},...], ec2:"FOUND", mtd:"$1,234", savings:"$56", grade:"Grade A (87.5)"}.
+    """
+    kinds = tuple(k for k in page_kinds if k in _JS_SCRAPERS)
+    if not kinds:
+        return {}
+    driver = current_driver()
+    out = driver.execute_script(_JS_CALL_PRELOADED, list(kinds))
+    if out is None:
+        out = driver.execute_script(_inline_scrape_js(kinds)) or {}
+    return {k: out.get(k) or _JS_SCRAPE_EMPTY[k] for k in kinds}
+
+def label_key_set(keys) -> frozenset:
+    """Casefolded, stripped, de-duplicated label keys; load_config builds these once per check."""
+    return frozenset(k.strip().casefold() for k in keys if k and k.strip())
+
+# Default label keys for the scan_labels fallback (same list global_config.yaml uses)
+SERVER_LABEL_KEYS = label_key_set(["total server", "total servers", "server", "servers", "서버", "총 서버"])
+
+# Element text, else the preloaded `kind` scraper; null when the preload is missing
+_JS_TEXT_OR_PRELOADED = r"""
+    const [e, kind] = arguments;
+    const t = e ? (e.innerText || e.textContent || "").trim() : "";
+    if (t) return {t};
+    const S = window.__hcScrapers;
+    if (!S) return null;
+    try { return {t: S[kind]()}; } catch (err) { return {t: null}; }
+"""
+
+def _coalesced_extract(elem, kind: str) -> str:
+    """`elem.text or js_scrape_all([kind])[kind]` in one round-trip (string-valued kinds only)."""
+    r = None
+    if elem is not None:
+        try:
+            r = current_driver().execute_script(_JS_TEXT_OR_PRELOADED, elem, kind)
+        except StaleElementReferenceException:
+            r = None
+    if r is None:
+        return js_scrape_all([kind])[kind].strip()
+    return (r.get("t") or "").strip()
+
+def pick_value_by_labels(rows: List[Dict[str, str]], label_keys) -> str:
+    """First row (page order) whose label contains a key (O(rows x keys)); else the first unlabeled number."""
+    if not isinstance(label_keys, frozenset):
+        label_keys = label_key_set(label_keys)
+    # Normalise once: (casefolded label, stripped value) for rows that carry a value
+    norm = [((r.get("label") or "").strip().casefold(), (r.get("value") or "").strip()) for r in rows]
+    norm = [(lab, val) for lab, val in norm if val]
+    for lab, val in norm:
+        if any(k in lab for k in label_keys):
+            return val
+    for lab, val in norm:
+        if lab == "" and val.replace(",", "").isdigit():
+            return val
+    return ""
 
 
 # ============================ CONFIG LOADING ============================
 
+@functools.lru_cache(maxsize=1)
+def _s3_client():
+    import boto3
+    return boto3.client("s3")
+
 def maybe_fetch_config_from_s3(uri: str, local: str = "config.yaml") -> str:
     if not uri:
         return local
-    import boto3
     assert uri.startswith("s3://")
     bucket, key = uri[5:].split("/", 1)
-    s3 = boto3.client("s3")
-    s3.download_file(bucket, key, local)
+    _s3_client().download_file(bucket, key, local)
     return local
 
+@functools.lru_cache(maxsize=512)
+def _parse_locator(kind: Optional[str], value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """{kind,value} -> (By.*, value); None for empty values. Non-xpath kinds are treated as CSS."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    return (By.XPATH, value) if (kind or "xpath").lower() == "xpath" else (By.CSS_SELECTOR, value)
+
+def parse_locators(locators: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    parsed = (_parse_locator(loc.get("kind"), loc.get("value")) for loc in locators or [])
+    return [p for p in parsed if p]
+
+def locator_label(loc: Tuple[str, str]) -> str:
+    """Report form of a parsed locator, e.g. 'xpath://em' / 'css:em.value'."""
+    by, value = loc
+    return f"{'xpath' if by == By.XPATH else 'css'}:{value}"
+
 def load_config(path: str) -> Dict[str, Any]:
     with open(path, "r", encoding="utf-8") as f:
         raw = yaml.safe_load(f) or {}
@@ -560,6 +1217,25 @@ def load_config(path: str) -> Dict[str, Any]:
     raw.setdefault("defaults", {})
     raw.setdefault("metadata_by_url", {})
     raw.setdefault("checks", [])
+
+    # Normalise metadata once ("service" -> "Service") so run_one_check only merges dicts
+    defaults = raw["defaults"]
+    raw["_metadata_base"] = {
+        "Site": defaults.get("site", ""),
+        "Company": defaults.get("company", ""),
+        "Service": "",
+        "Menu": "",
+    }
+    raw["_metadata_by_url_norm"] = {
+        url: {k.capitalize(): v for k, v in (m or {}).items()}
+        for url, m in raw["metadata_by_url"].items()
+    }
+    for c in raw["checks"]:
+        c["_metadata_norm"] = {k.capitalize(): v for k, v in (c.get("metadata") or {}).items()}
+        c["_locators"] = parse_locators(c.get("locators", []))
+        js_fb = c.get("js_fallback") or {}
+        if js_fb.get("label_keys"):
+            js_fb["_label_keys"] = label_key_set(js_fb["label_keys"])
     return raw
 
 
@@ -571,9 +1247,11 @@ EXCEL_COLUMNS = [
 
 def make_result(meta: Dict[str, str], url: str, check_name: str,
                 locator_used: str, value: str, status: str,
-                screenshot_path: Optional[str] = None) -> Dict[str, str]:
-    if status == "FAIL" and not screenshot_path:
-        screenshot_path = snap(check_name.replace(" ", "_") + "_Fail")
+                screenshot_path: Optional[str] = None, capture: bool = True) -> Dict[str, Any]:
+    """capture=False: no browser behind this result, so FAIL rows get no screenshot."""
+    screenshot_b64 = None
+    if status == "FAIL" and not screenshot_path and capture:
+        screenshot_path, screenshot_b64 = snap_deferred(check_name.replace(" ", "_") + "_Fail")
     screenshot_name = os.path.basename(screenshot_path) if screenshot_path else ""
     return {
         "Site": meta.get("Site", ""),
@@ -585,71 +1263,133 @@ def make_result(meta: Dict[str, str], url: str, check_name: str,
         "Locator": locator_used or "",
         "Value": value or "",
         "Status": status,
-        "Screenshot": screenshot_name
+        "Screenshot": screenshot_name,
+        # not a report column: in-memory capture for the Slack upload
+        "_screenshot_b64": screenshot_b64,
     }
 
-def save_report(rows: List[Dict[str, str]]) -> str:
-    df = pd.DataFrame(rows)
-    for col in EXCEL_COLUMNS:
-        if col not in df.columns:
-            df[col] = ""
-    df = df[EXCEL_COLUMNS]
+class ResultsBuffer:
+    """Report rows stored column-wise (one list per EXCEL_COLUMNS entry) so the DataFrame build is columnar."""
+
+    def __init__(self):
+        self.cols: Dict[str, List[str]] = {c: [] for c in EXCEL_COLUMNS}
+
+    def append(self, **row):
+        for k in EXCEL_COLUMNS:
+            self.cols[k].append(row.get(k, ""))
+
+    def __len__(self) -> int:
+        return len(self.cols[EXCEL_COLUMNS[0]])
+
+def save_report(results: ResultsBuffer) -> str:
+    df = pd.DataFrame(results.cols, columns=EXCEL_COLUMNS, copy=False)
 
     out = f"{EXCEL_FILE_PREFIX}_{ts()}.xlsx"
-    df.to_excel(out, index=False)
-
-    wb = load_workbook(out)
-    ws = wb.active
-    header_map = {ws.cell(row=1, column=c).value: c for c in range(1, ws.max_column + 1)}
-    status_col = header_map.get("Status")
-
-    green = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    red   = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-
-    if status_col:
-        for r in range(2, ws.max_row + 1):
-            cell = ws.cell(row=r, column=status_col)
-            if cell.value == "PASS":
-                cell.fill = green
-            elif cell.value == "FAIL":
-                cell.fill = red
-
-    wb.save(out)
-    print(f"\nReport saved: {out}")
+    # Single write pass; Status colouring is one conditional-format rule per value instead of per-cell fills
+    with pd.ExcelWriter(out, engine="xlsxwriter") as writer:
+        df.to_excel(writer, index=False, sheet_name="Sheet1")
+        wb = writer.book
+        ws = writer.sheets["Sheet1"]
+        status_col = EXCEL_COLUMNS.index("Status")
+
+        green = wb.add_format({"bg_color": "#C6EFCE"})
+        red   = wb.add_format({"bg_color": "#FFC7CE"})
+
+        if len(df):
+            ws.conditional_format(1, status_col, len(df), status_col,
+                                  {"type": "cell", "criteria": "==", "value": '"PASS"', "format": green})
+            ws.conditional_format(1, status_col, len(df), status_col,
+                                  {"type": "cell", "criteria": "==", "value": '"FAIL"', "format": red})
+
+    log(f"\nReport saved: {out}")
     return out
 
 
 # ============================ XERTICA HELPERS ============================
 
+_JS_READ_TOPBAR = r"""
+    const sel_candidates = [
+      "div.header__company","div.company-name","a.topbar-company","button.company-toggle","div.header .company",
+      "div.bs-select-inline",".company-selector",".header-company"
+    ];
+    const text = el => (el && el.getClientRects().length ? (el.innerText || "") : "").trim().toLowerCase();
+    for (const s of sel_candidates) {
+      const t = text(document.querySelector(s));
+      if (t) return t;
+    }
+    for (const e of document.querySelectorAll("header *, nav *, div.topbar *, div.header *")) {
+      const t = text(e);
+      if (t && t.length < 120 && (t.includes("xertica") || t.includes("*") || t.includes("transportes"))) return t;
+    }
+    return "";
+"""
+
+# Arrow function: called with the target text; resolves as soon as a DOM mutation makes the option clickable
+_JS_COMPANY_SWITCH = r"""
+(targetText) => {
+    const target = targetText.trim().toLowerCase();
+    const isVisible = el => !!el && getComputedStyle(el).display !== 'none' && getComputedStyle(el).visibility !== 'hidden' && (el.offsetParent !== null || el.getClientRects().length);
+    const toggles = Array.from(document.querySelectorAll('a,button,div,span,p')).filter(n=>{
+      try{
+        const t=(n.innerText||'').trim().toLowerCase();
+        return isVisible(n) && (t.includes('*') || /transportes|company|empresa|cliente|client|8091/i.test(t) || n.getAttribute('aria-haspopup')==='true' || n.getAttribute('role')==='button');
+      }catch(e){return false;}
+    });
+    if(toggles.length){
+      try{ toggles[0].scrollIntoView({block:'center',inline:'center'}); toggles[0].click(); }catch(e){}
+    }
+    const findAndClick = ()=>{
+      const opts = Array.from(document.querySelectorAll('li,div,button,a,span,p'))
+        .filter(n=> isVisible(n) && (n.innerText||'').trim().toLowerCase().includes(target));
+      if(opts.length){
+        try{ opts[0].scrollIntoView({block:'center',inline:'center'}); opts[0].click(); return true;}catch(e){}
+        try{
+          opts[0].dispatchEvent(new MouseEvent('mousedown',{bubbles:true}));
+          opts[0].dispatchEvent(new MouseEvent('mouseup',{bubbles:true}));
+          opts[0].dispatchEvent(new MouseEvent('click',{bubbles:true}));
+          return true;
+        }catch(e){}
+      }
+      return false;
+    };
+    if(findAndClick()) return true;
+    return new Promise(res => {
+      const obs = new MutationObserver(() => {
+        if(findAndClick()){ obs.disconnect(); clearTimeout(timer); res(true); }
+      });
+      obs.observe(document.body, {childList:true, subtree:true, attributes:true});
+      const timer = setTimeout(() => { obs.disconnect(); res(findAndClick()); }, 2000);
+    });
+}
+"""
+
+def _run_company_switch(driver: webdriver.Chrome, target: str) -> bool:
+    """Evaluate _JS_COMPANY_SWITCH via CDP and await its promise (async-script fallback)."""
+    expr = f"({_JS_COMPANY_SWITCH})({json.dumps(target)})"
+    try:
+        res = driver.execute_cdp_cmd("Runtime.evaluate", {
+            "expression": expr, "awaitPromise": True, "returnByValue": True,
+        })
+        return bool((res.get("result") or {}).get("value"))
+    except Exception:
+        js = f"const cb = arguments[arguments.length - 1]; Promise.resolve(({_JS_COMPANY_SWITCH})(arguments[0])).then(cb, () => cb(false));"
+        return bool(driver.execute_async_script(js, target))
+
 def switch_company_to_force(target_text="Xertica Clientes por reconocer",
                             wait_after=2, timeout=10) -> bool:
     """
     Try hard to switch the topbar/company selector to the target.
     Returns True if verified in topbar text.
     """
+    driver = current_driver()
     target = target_text.strip().lower()
 
     def read_topbar_text() -> str:
-        sel_candidates = [
-            "div.header__company","div.company-name","a.topbar-company","button.company-toggle","div.header .company",
-            "div.bs-select-inline",".company-selector",".header-company"
-        ]
-        for s in sel_candidates:
-            try:
-                el = driver.find_element(By.CSS_SELECTOR, s)
-                if el and el.text:
-                    return el.text.strip().lower()
-            except Exception:
-                pass
+        # Candidate selectors + header scan run browser-side in a single round-trip
         try:
-            els = driver.find_elements(By.CSS_SELECTOR, "header *, nav *, div.topbar *, div.header *")
-            for e in els:
-                t = (e.text or "").strip().lower()
-                if t and len(t) < 120 and ("xertica" in t or "*" in t or "transportes" in t):
-                    return t
+            return driver.execute_script(_JS_READ_TOPBAR) or ""
         except Exception:
-            pass
-        return ""
+            return ""
 
     def poll_for_verify(seconds=6):
         for _ in range(seconds):
@@ -662,119 +1402,188 @@ def switch_company_to_force(target_text="Xertica Clientes por reconocer",
     try:
         ok, cur = poll_for_verify(seconds=1)
         if ok:
-            print("Company already selected:", cur)
+            log("Company already selected:", cur)
             return True
 
-        js_switch = r"""
-        const target = arguments[0].trim().toLowerCase();
-        const isVisible = el => !!el && getComputedStyle(el).display !== 'none' && getComputedStyle(el).visibility !== 'hidden' && (el.offsetParent !== null || el.getClientRects().length);
-        const toggles = Array.from(document.querySelectorAll('a,button,div,span,p')).filter(n=>{
-          try{
-            const t=(n.innerText||'').trim().toLowerCase();
-            return isVisible(n) && (t.includes('*') || /transportes|company|empresa|cliente|client|8091/i.test(t) || n.getAttribute('aria-haspopup')==='true' || n.getAttribute('role')==='button');
-          }catch(e){return false;}
-        });
-        if(toggles.length){
-          try{ toggles[0].scrollIntoView({block:'center',inline:'center'}); toggles[0].click(); }catch(e){}
-        }
-        const findAndClick = ()=>{
-          const opts = Array.from(document.querySelectorAll('li,div,button,a,span,p'))
-            .filter(n=> isVisible(n) && (n.innerText||'').trim().toLowerCase().includes(target));
-          if(opts.length){
-            try{ opts[0].scrollIntoView({block:'center',inline:'center'}); opts[0].click(); return true;}catch(e){}
-            try{
-              opts[0].dispatchEvent(new MouseEvent('mousedown',{bubbles:true}));
-              opts[0].dispatchEvent(new MouseEvent('mouseup',{bubbles:true}));
-              opts[0].dispatchEvent(new MouseEvent('click',{bubbles:true}));
-              return true;
-            }catch(e){}
-          }
-          return false;
-        };
-        if(findAndClick()) return true;
-        const end = Date.now() + 2000;
-        while(Date.now() < end){
-          if(findAndClick()) return true;
-        }
-        return false;
-        """
-        clicked = bool(driver.execute_script(js_switch, target))
-        print("Company selector JS click attempted:", clicked)
+        clicked = _run_company_switch(driver, target)
+        log("Company selector JS click attempted:", clicked)
 
         ok, cur = poll_for_verify(seconds=4)
         if ok:
-            print("Switched company (verified):", cur)
+            log("Switched company (verified):", cur)
             return True
 
-        print("Company switch not verified; attempting reload as last resort…")
+        log("Company switch not verified; attempting reload as last resort…")
         driver.refresh()
         time.sleep(1.5)
         ok, cur = poll_for_verify(seconds=6)
         if ok:
-            print("Switched company after reload (verified):", cur)
+            log("Switched company after reload (verified):", cur)
             return True
         else:
-            print("After reload — still not switched. topbar:", cur)
+            log("After reload — still not switched. topbar:", cur)
     except Exception as e:
-        print("switch_company_to_force error:", e)
+        log("switch_company_to_force error:", e)
     return False
 
+@functools.lru_cache(maxsize=16)
+def _option_xpath(option_text: str) -> str:
+    txt = option_text.strip().lower()
+    return f"//*[contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), {json.dumps(txt)})]"
+
+# Evaluate the XPath, filter to displayed nodes and click the first one — all in one round-trip
+_JS_CLICK_FIRST_VISIBLE = r"""
+    const snap = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < snap.snapshotLength; i++) {
+      const el = snap.snapshotItem(i);
+      if (!el.getClientRects().length || getComputedStyle(el).visibility === "hidden") continue;
+      try { el.click(); return true; } catch (e) {}
+    }
+    return false;
+"""
+
 def select_only_xertica_option(option_text="Xertica Clientes por reconocer") -> bool:
     """Light attempt to click an option with visible text (scheduler inner panel)."""
+    driver = current_driver()
     try:
-        txt = option_text.strip().lower()
-        opt_xpath = f"//*[contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), {json.dumps(txt)})]"
-        opts = driver.find_elements(By.XPATH, opt_xpath)
-        for o in opts:
-            if o.is_displayed():
-                try:
-                    o.click()
-                    return True
-                except Exception:
-                    try:
-                        driver.execute_script("arguments[0].click();", o)
-                        return True
-                    except Exception:
-                        pass
-        return False
+        return bool(driver.execute_script(_JS_CLICK_FIRST_VISIBLE, _option_xpath(option_text)))
     except Exception as e:
-        print("select_only_xertica_option error:", e)
+        log("select_only_xertica_option error:", e)
         return False
 
 
 # ============================ CHECK DISPATCHER ============================
 
-def run_one_check(check: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, str]:
+# [[By.*, value], ...] -> [index, element] of the first (in list order) locator whose match is visible, else null
+_JS_FIRST_VISIBLE_LOCATOR = r"""
+    const locs = arguments[0];
+    const visible = el => el instanceof Element && getComputedStyle(el).visibility !== "hidden" &&
+      (el.offsetParent !== null || el.getClientRects().length > 0);
+    for (let i = 0; i < locs.length; i++) {
+      const [kind, value] = locs[i];
+      let el = null;
+      try {
+        el = kind === "xpath"
+          ? document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+          : document.querySelector(value);
+      } catch (e) { continue; }
+      if (visible(el)) return [i, el];
+    }
+    return null;
+"""
+
+# (By.*, value) -> {count, matches:[first 5 as {outer, tc, it, disp}]} in one round-trip
+_JS_LOCATOR_DEBUG = r"""
+    const [kind, value] = arguments;
+    let els = [];
+    if (kind === "xpath") {
+      const r = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      for (let i = 0; i < r.snapshotLength; i++) els.push(r.snapshotItem(i));
+    } else {
+      els = Array.from(document.querySelectorAll(value));
+    }
+    return {count: els.length, matches: els.slice(0, 5).map(e => ({
+      outer: (e.outerHTML || "").slice(0, 200),
+      tc: e.textContent || "",
+      it: e.innerText || "",
+      disp: e instanceof Element && (e.offsetParent !== null || e.getClientRects().length > 0),
+    }))};
+"""
+
+# ---- per-type result handlers: (elem, meta, url, name, matched, js_fb) -> result row ----
+
+def _handle_mtd_cost(elem, meta, url, name, matched, js_fb):
+    value = wait_non_empty_text(lambda: elem.text, 30) if elem else ""
+    if not value or "$" not in value:
+        log("Falling back to JS scan for Month to Date Cost…")
+        value = js_scrape_all(["mtd"])["mtd"].strip()
+    status = "PASS" if value else "FAIL"
+    return make_result(meta, url, name, matched or "[JS MTD cost]", value, status)
+
+def _handle_more_available_total(elem, meta, url, name, matched, js_fb):
+    value = _coalesced_extract(elem, "savings")
+    status = "PASS" if value else "FAIL"
+    return make_result(meta, url, name, matched or "[JS MoreAvailable Total]", value, status)
+
+def _handle_cei_grade(elem, meta, url, name, matched, js_fb):
+    value = (wait_non_empty_text(lambda: elem.text, 15) if elem else "") or js_scrape_all(["grade"])["grade"].strip()
+    status = "PASS" if value else "FAIL"
+    return make_result(meta, url, name, matched or "[JS CEI grade]", value, status)
+
+def _handle_element_exists(elem, meta, url, name, matched, js_fb):
+    status = "PASS" if elem else "FAIL"
+    value = "FOUND" if elem else ""
+    if status == "FAIL" and js_fb.get("strategy") == "ec2_near_aws":
+        log("Falling back to JS: EC2 near AWS…")
+        if js_scrape_all(["ec2"])["ec2"]:
+            status, value, matched = "PASS", "FOUND", "[JS EC2-near-AWS]"
+    return make_result(meta, url, name, matched or "n/a", value, status)
+
+def _handle_value_required(elem, meta, url, name, matched, js_fb):
+    value = wait_non_empty_text(lambda: elem.text, 15) if elem else ""
+    if (not value) and js_fb.get("strategy") == "scan_labels":
+        log("Falling back to JS scan for label-based value…")
+        rows = js_scrape_all(["labels"])["labels"]
+        dump_json("Asset_ScanLabels", rows)
+        label_keys = js_fb.get("_label_keys") or js_fb.get("label_keys") or SERVER_LABEL_KEYS
+        value = pick_value_by_labels(rows, label_keys)
+    status = "PASS" if value else "FAIL"
+    return make_result(meta, url, name, matched or "[JS scan fallback]", value, status)
+
+_CTYPE_HANDLERS = {
+    "mtd_cost": _handle_mtd_cost,
+    "more_available_total": _handle_more_available_total,
+    "cei_grade": _handle_cei_grade,
+    "element_exists": _handle_element_exists,
+    "value_required": _handle_value_required,
+}
+
+def check_metadata(check: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, str]:
+    # Metadata precedence: defaults -> metadata_by_url[url] -> per-check metadata (normalised in load_config)
+    return {
+        **cfg["_metadata_base"],
+        **cfg["_metadata_by_url_norm"].get(check["url"], {}),
+        **check.get("_metadata_norm", {}),
+    }
+
+def run_one_check(check: Dict[str, Any], cfg: Dict[str, Any],
+                  driver: Optional[webdriver.Chrome] = None,
+                  wait: Optional[WebDriverWait] = None) -> Dict[str, str]:
     """
     check: {
-      name, url, type, locators:[{kind,value},...],
+      name, url, type, locators:[{kind,value},...] (parsed into _locators by load_config),
+      (optional) mode: browser (default) | http -> run_http_check instead,
+      (optional) locator_timeout (seconds), fail_fast (only try the first locator),
       js_fallback:{strategy:..., label_keys:[]}, metadata:{...},
       (optional) login_url, login_username, login_password
     }
+    driver/wait: browser to run on; defaults to the one bound to the calling thread.
     """
+    if driver is not None and driver is not current_driver():
+        with bound_driver(driver, wait or make_wait(driver, TIMEOUT)):
+            return run_one_check(check, cfg)
+    with _no_implicit_wait(current_driver()):
+        return _run_one_check(check, cfg)
+
+def _run_one_check(check: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, str]:
+    driver = current_driver()
     url = check["url"]
     name = check["name"]
     ctype = (check.get("type") or "value_required").lower()
-    locators = check.get("locators", [])
+    # Parsed (By.*, value) tuples from load_config; parse here for checks built elsewhere
+    locators = check.get("_locators")
+    if locators is None:
+        locators = parse_locators(check.get("locators", []))
+    if check.get("fail_fast"):
+        locators = locators[:1]   # caller knows only the first locator can match
     js_fb = check.get("js_fallback") or {}
-    per_meta = check.get("metadata") or {}
+    # Render + locator wait budget: check.locator_timeout -> defaults.locator_timeout -> 10s
+    loc_timeout = float(check.get("locator_timeout")
+                        or (cfg.get("defaults") or {}).get("locator_timeout") or 10)
 
-    # Build metadata precedence: defaults -> metadata_by_url[url] -> per-check metadata
-    defaults = cfg.get("defaults", {})
-    meta_by_url = cfg.get("metadata_by_url", {})
-    meta: Dict[str, str] = {
-        "Site": defaults.get("site", ""),
-        "Company": defaults.get("company", ""),
-        "Service": "",
-        "Menu": "",
-    }
-    url_meta = meta_by_url.get(url, {})
-    for k, v in url_meta.items():
-        meta[k.capitalize()] = v
-    for k, v in per_meta.items():
-        meta[k.capitalize()] = v
+    meta = check_metadata(check, cfg)
 
-    print(f"\n→ {name} @ {url}")
+    log(f"\n→ {name} @ {url}")
 
     # Optional per-check login first (if provided in YAML)
     login_url = check.get("login_url") or LOGIN_URL
@@ -792,7 +1601,7 @@ def run_one_check(check: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, str]:
             open_with_sso(login_url, name.replace(" ", "_") + "_login",
                           username_override=login_user, password_override=login_pass)
     except Exception as e:
-        print(f"Login warning for {login_url}: {e} (continuing)")
+        log(f"Login warning for {login_url}: {e} (continuing)")
 
     # --- NEW: also prefer Xertica creds for the target URL navigation if it's an xertica domain ---
     nav_user = None
@@ -810,7 +1619,7 @@ def run_one_check(check: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, str]:
         open_with_sso(url, name.replace(" ", "_"),
                       username_override=nav_user, password_override=nav_pass)
     except Exception as e:
-        print(f"Navigation warning for {url}: {e} (continuing)")
+        log(f"Navigation warning for {url}: {e} (continuing)")
 
     # Xertica scheduler-specific pre-steps (company switch + light option select)
     try:
@@ -818,187 +1627,319 @@ def run_one_check(check: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, str]:
            ("asset.xertica.cloud/asset/scheduler" in driver.current_url.lower()):
             try:
                 switched = switch_company_to_force("Xertica Clientes por reconocer")
-                print("Company switch attempted:", switched)
+                log("Company switch attempted:", switched)
             except Exception as e:
-                print("switch_company_to_force error (continuing):", e)
+                log("switch_company_to_force error (continuing):", e)
             try:
                 tried = select_only_xertica_option("Xertica Clientes por reconocer")
-                print("Xertica option selection attempted:", tried)
+                log("Xertica option selection attempted:", tried)
             except Exception as e:
-                print("select_only_xertica_option error (continuing):", e)
+                log("select_only_xertica_option error (continuing):", e)
     except Exception as e:
-        print("Xertica pre-step error:", e)
+        log("Xertica pre-step error:", e)
+
+    def probe(d):
+        # a navigation landing mid-script destroys the execution context: treat it as "not yet"
+        try:
+            return d.execute_script(_JS_FIRST_VISIBLE_LOCATOR, locators)
+        except JavascriptException:
+            return None
+
+    # One synchronous probe first: a locator that is already visible skips both waits below
+    hit = None
+    if locators:
+        try:
+            hit = probe(driver)
+        except Exception:
+            hit = None
 
     # Let SPA render something
-    try:
-        WebDriverWait(driver, 10).until(
-            lambda d: len(d.find_elements(By.CSS_SELECTOR,
-                    "em.value, .value, .num, .number, .count, .am5-layer")) > 0
-        )
-    except TimeoutException:
-        pass
+    if not hit:
+        wait_for_value_nodes(loc_timeout)
 
     # Optional deep locator debug
     if LOCATOR_DEBUG and locators:
         try:
-            for loc in locators:
-                kind = (loc.get("kind") or "xpath").lower()
-                value = (loc.get("value") or "").strip()
-                if not value:
-                    continue
+            for by, value in locators:
                 try:
-                    elems = (driver.find_elements(By.XPATH, value)
-                             if kind == "xpath" else driver.find_elements(By.CSS_SELECTOR, value))
-                    print(f"DEBUG locator ({kind}): {value}  ->  matches: {len(elems)}")
-                    for i, e in enumerate(elems[:5]):
-                        try:
-                            outer = driver.execute_script("return arguments[0].outerHTML.slice(0,200);", e)
-                        except Exception:
-                            outer = "<outerHTML unavailable>"
-                        try:
-                            selenium_text = e.text
-                        except Exception:
-                            selenium_text = ""
-                        try:
-                            raw_text = driver.execute_script("return arguments[0].textContent;", e) or ""
-                            inner_text = driver.execute_script("return arguments[0].innerText;", e) or ""
-                        except Exception:
-                            raw_text = inner_text = ""
-                        print(f"   - match[{i}] displayed={e.is_displayed()} text={repr(selenium_text)}")
-                        print(f"     textContent={repr(raw_text)}, innerText={repr(inner_text)}")
-                        print(f"     outerHTML~200={outer}")
+                    info = driver.execute_script(_JS_LOCATOR_DEBUG, by, value)
+                    log(f"DEBUG locator ({by}): {value}  ->  matches: {info['count']}")
+                    for i, m in enumerate(info["matches"]):
+                        log(f"   - match[{i}] displayed={m['disp']} text={repr(m['it'])}")
+                        log(f"     textContent={repr(m['tc'])}, innerText={repr(m['it'])}")
+                        log(f"     outerHTML~200={m['outer']}")
                 except Exception as ex:
-                    print("  DEBUG locator error for", value, ":", ex)
+                    log("  DEBUG locator error for", value, ":", ex)
         except Exception:
             pass
 
-    # Try primary locators
+    # Try primary locators: every candidate is checked browser-side in one script per poll
     elem = None
     matched = None
-    for loc in locators:
-        kind = (loc.get("kind") or "xpath").lower()
-        value = (loc.get("value") or "").strip()
-        if not value:
-            continue
+    if hit:
+        idx, elem = hit
+        matched = locator_label(locators[idx])
+    elif locators:
         try:
-            cond = EC.visibility_of_element_located(
-                (By.XPATH, value) if kind == "xpath" else (By.CSS_SELECTOR, value)
-            )
-            elem = WebDriverWait(driver, 10).until(cond)
-            matched = f"{kind}:{value}"
-            break
+            idx, elem = cached_wait(loc_timeout).until(probe)
+            matched = locator_label(locators[idx])
         except TimeoutException:
-            continue
-
-    # Specialized types
-    if ctype == "mtd_cost":
-        value = wait_non_empty_text(lambda: elem.text, 30) if elem else ""
-        if not value or "$" not in value:
-            print("Falling back to JS scan for Month to Date Cost…")
-            value = js_find_mtd_cost().strip()
-        status = "PASS" if value else "FAIL"
-        res = make_result(meta, url, name, matched or "[JS MTD cost]", value, status)
-
-    elif ctype == "more_available_total":
-        value = (elem.text.strip() if elem else "") or js_find_more_available_total().strip()
-        status = "PASS" if value else "FAIL"
-        res = make_result(meta, url, name, matched or "[JS MoreAvailable Total]", value, status)
-
-    elif ctype == "cei_grade":
-        value = (wait_non_empty_text(lambda: elem.text, 15) if elem else "") or js_find_ceikpi_grade_full().strip()
-        status = "PASS" if value else "FAIL"
-        res = make_result(meta, url, name, matched or "[JS CEI grade]", value, status)
-
-    elif ctype == "element_exists":
-        status = "PASS" if elem else "FAIL"
-        value = "FOUND" if elem else ""
-        if status == "FAIL" and js_fb.get("strategy") == "ec2_near_aws":
-            print("Falling back to JS: EC2 near AWS…")
-            if js_find_ec2_near_aws():
-                status, value, matched = "PASS", "FOUND", "[JS EC2-near-AWS]"
-        res = make_result(meta, url, name, matched or "n/a", value, status)
-
-    else:  # value_required (generic)
-        value = wait_non_empty_text(lambda: elem.text, 15) if elem else ""
-        if (not value) and js_fb.get("strategy") == "scan_labels":
-            print("Falling back to JS scan for label-based value…")
-            rows = js_scan_labels()
-            dump_json("Asset_ScanLabels", rows)
-            label_keys = js_fb.get("label_keys") or SERVER_LABEL_KEYS
-            value = pick_value_by_labels(rows, label_keys)
-        status = "PASS" if value else "FAIL"
-        res = make_result(meta, url, name, matched or "[JS scan fallback]", value, status)
+            pass
+
+    # Specialized types (anything unknown is treated as value_required)
+    handler = _CTYPE_HANDLERS.get(ctype, _handle_value_required)
+    res = handler(elem, meta, url, name, matched, js_fb)
 
     if res["Status"] == "FAIL":
         reason = f"{ctype} failed (locator: {res['Locator']})"
         screenshot_full = os.path.join("screenshots", res["Screenshot"]) if res["Screenshot"] else None
-        slack_notify(name, reason, screenshot_full)
+        record_failure(name, reason, screenshot_full, res.get("_screenshot_b64"))
 
-    print(f"Result: {res['Status']} | Value: {res['Value']}")
+    log(f"Result: {res['Status']} | Value: {res['Value']}")
     return res
 
 
-# ============================ MAIN ============================
+# mode: http fetches: no retries, so a dead endpoint costs one TIMEOUT rather than _HTTP's three
+_HTTP_CHECKS = requests.Session()
+for _scheme in ("https://", "http://"):
+    _HTTP_CHECKS.mount(_scheme, HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
 
-if __name__ == "__main__":
-    print("Starting health check…")
-    try:
-        ensure_dirs()
-        # Create driver up front so helpers can use it
-        driver, wait = create_driver()
+def _html_text(match: Any) -> str:
+    # xpath can yield elements, attribute/text strings or scalars (count(), boolean())
+    return (match.text_content() if hasattr(match, "text_content") else str(match)).strip()
 
-        # Optionally fetch config.yaml from S3
-        cfg_path = maybe_fetch_config_from_s3(CONFIG_URI, CONFIG_PATH_LOCAL)
-        cfg = load_config(cfg_path)
+def run_http_check(check: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, str]:
+    """
+    mode: http — GET the URL with requests and evaluate the locators on the served HTML with lxml.
+    No browser, so only for pages whose value is in the raw HTML (no JS render, no SSO).
+    element_exists passes on any match; every other type needs a non-empty text.
+    """
+    import lxml.html   # optional dependency: only needed once a config uses mode: http
 
-        # Allow YAML to override a couple of runtime defaults if provided
-        TIMEOUT_yaml = cfg.get("defaults", {}).get("timeout")
-        RENDER_yaml  = cfg.get("defaults", {}).get("render_retry")
-        if TIMEOUT_yaml: TIMEOUT = int(TIMEOUT_yaml)
-        if RENDER_yaml:  RENDER_RETRY = int(RENDER_yaml)
+    url = check["url"]
+    name = check["name"]
+    ctype = (check.get("type") or "value_required").lower()
+    locators = check.get("_locators")
+    if locators is None:
+        locators = parse_locators(check.get("locators", []))
+    meta = check_metadata(check, cfg)
 
-        # Initial console login (if LOGIN_URL is set)
-        login_console()
+    log(f"\n→ {name} @ {url} [http]")
 
-        results: List[Dict[str, str]] = []
-        for c in cfg.get("checks", []):
+    value, matched = "", None
+    try:
+        resp = _HTTP_CHECKS.get(url, timeout=TIMEOUT)
+        resp.raise_for_status()
+        tree = lxml.html.fromstring(resp.content, base_url=resp.url)
+        for loc in locators:
+            by, sel = loc
             try:
-                results.append(run_one_check(c, cfg))
+                matches = tree.xpath(sel) if by == By.XPATH else tree.cssselect(sel)
             except Exception as e:
-                print(f"Check '{c.get('name','<unnamed>')}' crashed: {e}")
-                try:
-                    snap("Check_Crashed_" + safe_filename(c.get('name','unnamed')))
-                    dump_html("Check_Crashed_" + safe_filename(c.get('name','unnamed')))
-                except Exception:
-                    pass
-                # still record a FAIL row with minimal info
-                meta = {"Site":"", "Company":"", "Service":"", "Menu":""}
-                results.append(make_result(meta, c.get("url",""), c.get("name",""), "", "", "FAIL"))
-
-        save_report(results)
-        print("\nDone.")
+                log(f"HTTP locator error for {sel}: {e} (continuing)")
+                continue
+            if not isinstance(matches, list):
+                # scalar xpath (boolean()/count()/string()): false, 0 and "" mean no match
+                matches = [matches] if matches else []
+            if ctype == "element_exists":
+                if matches:
+                    value, matched = "FOUND", locator_label(loc)
+                    break
+                continue
+            texts = [t for t in map(_html_text, matches) if t]
+            if texts:
+                value, matched = texts[0], locator_label(loc)
+                break
     except Exception as e:
-        print(f"Fatal error: {e}")
+        log(f"HTTP fetch failed for {url}: {e}")
+
+    status = "PASS" if value else "FAIL"
+    res = make_result(meta, url, name, matched or "[http]", value, status, capture=False)
+    if status == "FAIL":
+        record_failure(name, f"{ctype} failed over http (locator: {res['Locator']})", None)
+    log(f"Result: {res['Status']} | Value: {res['Value']}")
+    return res
+
+
+def _crashed_result(check: Dict[str, Any], e: Exception, capture: bool = True) -> Dict[str, str]:
+    log(f"Check '{check.get('name','<unnamed>')}' crashed: {e}")
+    if capture:
+        fname = "Check_Crashed_" + safe_filename(check.get('name','unnamed'))
         try:
-            snap("Fatal_Error")
-            dump_html("Fatal_Error")
+            snap(fname)
+            dump_html(fname)
         except Exception:
             pass
-        slack_notify("Fatal Error", str(e), None)
+    # still record a FAIL row with minimal info
+    meta = {"Site":"", "Company":"", "Service":"", "Menu":""}
+    return make_result(meta, check.get("url",""), check.get("name",""), "", "", "FAIL", capture=capture)
+
+def is_http_check(check: Dict[str, Any]) -> bool:
+    return (check.get("mode") or "browser").lower() == "http"
+
+def run_check_over_http(check: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, str]:
+    """mode: http checks never touch the pool (crash -> FAIL row)."""
+    try:
+        return run_http_check(check, cfg)
+    except Exception as e:
+        return _crashed_result(check, e, capture=False)
+
+def run_check_in_pool(pool: BrowserPool, check: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, str]:
+    """Acquire a browser, bind it to this thread and run one check (crash -> FAIL row)."""
+    try:
+        item = pool.acquire()
+    except Exception as e:
+        return _crashed_result(check, e)
+    driver, wait = item
+    broken = False
+    try:
+        with bound_driver(driver, wait):
+            try:
+                return run_one_check(check, cfg, driver=driver, wait=wait)
+            except Exception as e:
+                return _crashed_result(check, e)
     finally:
-        print("Closing browser…")
-        try:
-            if driver:
-                driver.quit()
-        except Exception:
-            pass
-        # Clean up the temp Chrome profile if we created one
-        try:
-            if TEMP_PROFILE_DIR and os.path.isdir(TEMP_PROFILE_DIR):
-                shutil.rmtree(TEMP_PROFILE_DIR, ignore_errors=True)
-        except Exception:
-            pass
+        if RESET_BETWEEN_CHECKS:
+            try:
+                _reset_between_checks(driver)
+            except Exception as e:
+                log(f"Browser reset failed ({e}); replacing it")
+                broken = True
+        pool.release(item, broken=broken)
+
+def _in_check_scope(check: Dict[str, Any], fn, *args):
+    """Run fn(*args) with log() lines on this worker prefixed by the check's name."""
+    token = _CHECK_NAME.set(check.get("name") or "<unnamed>")
+    try:
+        return fn(*args)
+    finally:
+        _CHECK_NAME.reset(token)
+
+def run_checks_concurrently(pool: BrowserPool, checks: List[Dict[str, Any]],
+                            cfg: Dict[str, Any]) -> ResultsBuffer:
+    """Fan checks out over the pool; results are buffered in config order."""
+    done: Dict[int, Dict[str, str]] = {}
+    with ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="check") as executor:
+        futures = {
+            (executor.submit(_in_check_scope, c, run_check_over_http, c, cfg) if is_http_check(c)
+             else executor.submit(_in_check_scope, c, run_check_in_pool, pool, c, cfg)): i
+            for i, c in enumerate(checks)
+        }
+        for fut in as_completed(futures):
+            done[futures[fut]] = fut.result()
+    results = ResultsBuffer()
+    for i in range(len(checks)):
+        results.append(**done[i])
+    return results
+
+
+# ============================ RUN LOOP ============================
+
+# Set from the SIGHUP handler and polled by the daemon loop. Handlers only flip this flag:
+# taking a lock there (Event.set, log) can deadlock against the main thread holding it.
+_RERUN_REQUESTED = False
+
+def _on_sighup(signum, frame):
+    global _RERUN_REQUESTED
+    _RERUN_REQUESTED = True
+
+def _on_sigterm(signum, frame):
+    # docker stop: unwind through the __main__ finally so queued work is flushed and browsers quit
+    raise SystemExit(128 + signum)
+
+def _sleep_until_next_run(seconds: int) -> bool:
+    """Sleep up to `seconds` in short steps; returns True if a SIGHUP cut it short."""
+    global _RERUN_REQUESTED
+    deadline = time.monotonic() + seconds
+    while not _RERUN_REQUESTED and time.monotonic() < deadline:
+        time.sleep(min(1.0, max(0.0, deadline - time.monotonic())))
+    requested, _RERUN_REQUESTED = _RERUN_REQUESTED, False
+    return requested
+
+def load_run_config() -> Dict[str, Any]:
+    """Fetch (S3 if configured) and parse the config, applying its runtime overrides."""
+    global TIMEOUT, RENDER_RETRY, POLL_FREQUENCY
+    cfg_path = maybe_fetch_config_from_s3(CONFIG_URI, CONFIG_PATH_LOCAL)
+    cfg = load_config(cfg_path)
+
+    # Allow YAML to override a couple of runtime defaults if provided
+    TIMEOUT_yaml = cfg.get("defaults", {}).get("timeout")
+    RENDER_yaml  = cfg.get("defaults", {}).get("render_retry")
+    POLL_yaml    = cfg.get("defaults", {}).get("poll_frequency")
+    if TIMEOUT_yaml: TIMEOUT = int(TIMEOUT_yaml)
+    if RENDER_yaml:  RENDER_RETRY = int(RENDER_yaml)
+    if POLL_yaml:    POLL_FREQUENCY = float(POLL_yaml)
+    return cfg
+
+def run_all_checks(pool: BrowserPool, cfg: Dict[str, Any]):
+    """One full pass: every check, the Excel report, one Slack summary of the failures."""
+    try:
+        results = run_checks_concurrently(pool, cfg.get("checks", []), cfg)
+        save_report(results)
+    finally:
+        slack_notify_bulk(take_failures())
+        flush_screenshots()
+        slack_flush()
+    log("\nDone.")
+
+def report_fatal(e: Exception):
+    log(f"Fatal error: {e}")
+    try:
+        snap("Fatal_Error")
+        dump_html("Fatal_Error")
+    except Exception:
+        pass
+    slack_notify("Fatal Error", str(e), None)
 
 
+# ============================ MAIN ============================
+
+if __name__ == "__main__":
+    log("Starting health check…")
+    # Installed before warm-up so a deploy's SIGHUP is never lost (PID 1 ignores unhandled signals)
+    signal.signal(signal.SIGHUP, _on_sighup)
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    pool: Optional[BrowserPool] = None
+    try:
+        ensure_dirs()
+
+        # Optionally fetch config.yaml from S3
+        cfg = load_run_config()
+
+        checks = cfg.get("checks", [])
+        # A fixed Chrome profile dir can only be opened by one browser at a time
+        browser_checks = sum(1 for c in checks if not is_http_check(c))
+        pool_size = 1 if CHROME_USER_DATA_DIR else min(POOL_SIZE, max(1, browser_checks))
+
+        # Pre-warm browsers up front (each does the initial console login if LOGIN_URL is set)
+        pool = BrowserPool(pool_size, MAX_USES_PER_INSTANCE)
+
+        if not RUN_INTERVAL_SECONDS:
+            run_all_checks(pool, cfg)
+        else:
+            # Daemon mode: browsers stay warm across runs; deploys with an unchanged image send SIGHUP
+            while True:
+                try:
+                    run_all_checks(pool, cfg)
+                except Exception as e:
+                    report_fatal(e)
+                log(f"Next run in {RUN_INTERVAL_SECONDS}s (SIGHUP to run now)…")
+                if _sleep_until_next_run(RUN_INTERVAL_SECONDS):
+                    log("SIGHUP received — re-running checks now…")
+                try:
+                    cfg = load_run_config()
+                except Exception as e:
+                    log(f"Config reload failed: {e} (keeping previous config)")
+    except Exception as e:
+        report_fatal(e)
+    finally:
+        # Finish queued screenshot writes / Slack posts before the daemon threads die with the process
+        flush_screenshots()
+        slack_flush()
+        log("Closing browser…")
+        # Quits every driver and cleans up the temp Chrome profiles we created
+        if pool:
+            pool.close()
+
 
 